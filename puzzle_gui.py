@@ -2,195 +2,150 @@
 
 import pygame
 import sys
-import random
+import queue
+import threading
 # Import core logic and the PDB loading function
 try:
-    from solver import PuzzleState, solve_puzzle, is_solvable, GOAL_STATE, load_pdb
+    from solver import GOAL_PACKED, find_blank, solve_packed, load_pdb
+    from puzzle_gui_draw import *
 except ImportError:
-    print("FATAL: Cannot import solver logic. Ensure 'solver.py' is in the same directory.")
+    print("FATAL: Cannot import solver logic. "
+          "Ensure 'solver.py' and 'puzzle_gui_draw.py' are in the same directory.")
     sys.exit()
 
-# --- Pygame Setup ---
-pygame.init()
-WIDTH, HEIGHT = 600, 780  
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("8-Puzzle Solver Interactive (PDB)")
-
-# --- Colors and Fonts ---
-WHITE = (255, 255, 255)
-BLACK = (0, 0, 0)
-LIGHT_GRAY = (200, 200, 200)
-DARK_GRAY = (100, 100, 100)
-GREEN = (50, 200, 50)
-RED = (200, 50, 50)
-FONT_SIZE = 40
-FONT = pygame.font.Font(None, FONT_SIZE)
-SMALL_FONT = pygame.font.Font(None, 24)
-
-# --- Board Dimensions ---
-GRID_SIZE = 3
-TILE_SIZE = WIDTH // GRID_SIZE
-BOARD_RECT = pygame.Rect(0, 0, WIDTH, WIDTH)
-
 # --- Global State ---
-current_board_tuple = GOAL_STATE
+current_board_v = GOAL_PACKED
+# Kept in step with current_board_v so slides never scan for the blank
+blank_index = find_blank(GOAL_PACKED)
+is_solved = True # current_board_v == GOAL_PACKED, refreshed only when the board changes
 solving_path = None
 path_index = 0
 solving = False
 solving_results = None 
-current_heuristic = "Manhattan Distance" # Legacy variable, now hardcoded to PDB/Manhattan
-
-# --- Button Configuration (Fixed Positions) ---
-BUTTON_Y = 610
-BUTTON_H = 50
-BUTTON_W = 160
-
-SHUFFLE_RECT = pygame.Rect(40, BUTTON_Y, BUTTON_W, BUTTON_H) 
-ACTION_RECT = pygame.Rect(220, BUTTON_Y, BUTTON_W, BUTTON_H)
-RESET_RECT = pygame.Rect(400, BUTTON_Y, BUTTON_W, BUTTON_H)
-
-# Info Label Position
-INFO_LABEL_RECT = pygame.Rect(10, HEIGHT - 70, WIDTH - 20, 30)
+pending_board = None # Board the background solver is working on, None when idle
+heuristic_name = HEURISTIC_NAMES[True] # Set from load_pdb's result at startup
+SOLVE_QUEUE = queue.Queue() # (board, solution_boards, explored) handed back by the solver thread
 
 # --- Drawing Functions ---
 
-def draw_board(screen, board):
-    """Draws the 3x3 grid and tiles."""
-    screen.fill(LIGHT_GRAY, BOARD_RECT)
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            index = i * GRID_SIZE + j
-            tile_value = board[index]
-            
-            x = j * TILE_SIZE
-            y = i * TILE_SIZE
-            
-            tile_rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-            pygame.draw.rect(screen, DARK_GRAY, tile_rect, 0)
-            pygame.draw.rect(screen, BLACK, tile_rect, 3) 
-            
-            if tile_value != 0:
-                text_surface = FONT.render(str(tile_value), True, WHITE)
-                text_rect = text_surface.get_rect(center=tile_rect.center)
-                screen.blit(text_surface, text_rect)
+def draw_controls(screen):
+    """Draws everything below the board: info label, scoreboard, buttons and status."""
+    screen.fill(WHITE, CONTROLS_RECT)
 
-def draw_button(screen, rect, text, color):
-    """Draws a clickable button."""
-    pygame.draw.rect(screen, color, rect, 0, 10)
-    text_surface = FONT.render(text, True, BLACK)
-    text_rect = text_surface.get_rect(center=rect.center)
-    screen.blit(text_surface, text_rect)
+    draw_info_label(screen, heuristic_name)
+    draw_scoreboard(screen, solving_results)
 
-def draw_info_label(screen):
-    """Draws a single label showing the active heuristic mode (PDB)."""
-    
-    mode_text = SMALL_FONT.render("Mode: Puzzle Solver (H: Pattern Database)", True, BLACK)
-    
-    mode_rect = mode_text.get_rect(center=INFO_LABEL_RECT.center)
-    screen.blit(mode_text, mode_rect)
+    # Buttons (solving is cleared as soon as the last step is shown, so there is no "finished"
+    # state)
+    screen.blit(BUTTON_BARS["next"] if solving else BUTTON_BARS["idle"], BUTTON_BAR_RECT)
 
-def draw_scoreboard(screen):
-    """Draws the performance results after a solve is complete."""
-    global solving_results
-    if not solving_results:
-        return
+    # Status Message 
+    if pending_board is not None:
+        status_text = SPINNER_FRAMES[get_spinner_frame()]
+    elif is_solved:
+        status_text = cached_text("SOLVED!", FONT, GREEN)
+    elif not solving and solving_results:
+         status_text = cached_text("Solver Metrics Above")
+    else:
+        status_text = cached_text("Ready to Play or Solve")
 
-    box_rect = pygame.Rect(50, HEIGHT - 110, WIDTH - 100, 70)
-    pygame.draw.rect(screen, DARK_GRAY, box_rect, 0, 10)
-    
-    # Display PDB as the heuristic
-    heuristic_text = SMALL_FONT.render(f"H: Pattern Database", True, WHITE)
-    moves_text = SMALL_FONT.render(f"Moves: {solving_results['moves']}", True, WHITE)
-    explored_text = SMALL_FONT.render(f"Nodes Explored: {solving_results['explored']}", True, WHITE)
+    status_rect = status_text.get_rect(center=(WIDTH // 2, 685))
+    screen.blit(status_text, status_rect)
 
-    screen.blit(heuristic_text, (box_rect.left + 10, box_rect.top + 5))
-    screen.blit(moves_text, (box_rect.left + 10, box_rect.top + 35))
-    screen.blit(explored_text, (box_rect.right - explored_text.get_width() - 10, box_rect.top + 35))
+def get_controls_state():
+    """Everything draw_controls depends on; the controls are redrawn only when this changes."""
+    spinner = get_spinner_frame() if pending_board is not None else None
+    return (solving, solving_results, is_solved, spinner)
 
 # --- Game Logic Functions ---
 
-def get_clicked_tile(pos):
-    """Converts mouse position to grid index (row, col)."""
-    if BOARD_RECT.collidepoint(pos):
-        col = pos[0] // TILE_SIZE
-        row = pos[1] // TILE_SIZE
-        return row, col
-    return None
+def set_board(board, blank=None):
+    """Replaces the current board and refreshes the state derived from it."""
+    global current_board_v, blank_index, is_solved
+    current_board_v = board
+    blank_index = find_blank(board) if blank is None else blank
+    is_solved = board == GOAL_PACKED
 
-def slide_tile(board, r1, c1):
-    """Handles the sliding logic when a tile is clicked."""
-    board_list = list(board)
-    current_index = r1 * GRID_SIZE + c1
-    blank_index = board_list.index(0)
-    
-    r_blank, c_blank = blank_index // GRID_SIZE, blank_index % GRID_SIZE
-    
-    dr = abs(r1 - r_blank)
-    dc = abs(c1 - c_blank)
-    
-    if (dr == 1 and dc == 0) or (dr == 0 and dc == 1):
-        board_list[current_index], board_list[blank_index] = \
-            board_list[blank_index], board_list[current_index]
-        return tuple(board_list)
-        
-    return board
-
-def shuffle_board():
-    """Generates a random, guaranteed solvable board."""
-    while True:
-        temp_list = [i for i in range(9)]
-        random.shuffle(temp_list)
-        temp_board = tuple(temp_list)
-        if is_solvable(temp_board):
-            return temp_board
+def solve_worker(board):
+    """Runs the A* solver off the main thread and hands the result back through SOLVE_QUEUE."""
+    try:
+        # solve_packed picks the heuristic itself: the PDB once loaded, Manhattan distance otherwise
+        solution_boards, explored = solve_packed(board)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        solution_boards, explored = None, 0
+    SOLVE_QUEUE.put((board, solution_boards, explored))
 
-def solve_and_prepare_path(board):
-    """Triggers the A* solver using the PDB heuristic."""
+def start_solve(board):
+    """Triggers the solver on a background thread."""
     
-    print("Solver initiated (Mode: PDB Solver)...")
-    
-    # Call the solver without the heuristic argument (it's hardcoded to PDB)
-    solution_states, explored = solve_puzzle(board) 
-    
-    if solution_states == "Unsolvable":
+    print(f"Solver initiated (H: {heuristic_name})...")
+    threading.Thread(target=solve_worker, args=(board,), daemon=True).start()
+
+def prepare_path(solution_boards, explored):
+    """Turns a finished solve (packed boards from solve_packed) into the path and results shown."""
+    if solution_boards == "Unsolvable":
         return None, None
-    elif solution_states:
-        moves = len(solution_states) - 1
+    elif solution_boards:
+        moves = len(solution_boards) - 1
         print(f"Solution found in {moves} moves. Nodes Explored: {explored}")
         
-        # Report Pattern Database as the heuristic used
-        results = {"moves": moves, "explored": explored, "heuristic": "Pattern Database"}
-        return solution_states, results
+        results = {"moves": moves, "explored": explored, "heuristic": heuristic_name,
+                   "scoreboard": render_scoreboard(moves, explored, heuristic_name)}
+        return solution_boards, results
     return None, None
 
 # --- Main Game Loop ---
+# Exposure means the OS dropped part of the window's contents, so everything has to be repainted
+EXPOSE_EVENTS = [pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED]
+HANDLED_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN] + EXPOSE_EVENTS
+IDLE_TIMEOUT_MS = 500 # Longest the loop sleeps in event.wait before running an empty frame
+FPS = 30 # Upper bound on frames per second while clicks are arriving
+
 def main():
-    global current_board_tuple, solving, solving_path, path_index, solving_results
+    global solving, solving_path, path_index, solving_results, pending_board
     clock = pygame.time.Clock()
+
+    # Only quit, clicks and exposure are handled; keep SDL from queueing motion, key and other
+    # window events
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(HANDLED_EVENTS)
     
-    current_board_tuple = shuffle_board()
+    set_board(shuffle_board())
     solving = False
 
+    # Only tiles and controls that changed since the last frame are redrawn and pushed to the
+    # display
+    prev_board = current_board_v
+    prev_controls = None
+    full_redraw = True
+
     while True:
-        SCREEN.fill(WHITE)
-        
         # --- Event Handling ---
-        for event in pygame.event.get():
+        # The puzzle only changes on clicks, so sleep until one arrives instead of polling
+        # (unless a full redraw is still waiting to be shown or the solver spinner is animating)
+        if full_redraw or pending_board is not None:
+            events = pygame.event.get(HANDLED_EVENTS)
+        else:
+            events = [pygame.event.wait(IDLE_TIMEOUT_MS)] + pygame.event.get(HANDLED_EVENTS)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            if event.type in EXPOSE_EVENTS:
+                full_redraw = True
+
             if event.type == pygame.MOUSEBUTTONDOWN:
                 pos = event.pos
                 
-                # Tile Click (Only if not solving)
-                if not solving and BOARD_RECT.collidepoint(pos):
+                # Tile Click (Only if not solving or waiting on the solver)
+                if not solving and pending_board is None and BOARD_RECT.collidepoint(pos):
                     solving_results = None 
-                    r, c = get_clicked_tile(pos)
-                    if r is not None:
-                        current_board_tuple = slide_tile(current_board_tuple, r, c)
-                        if current_board_tuple == GOAL_STATE:
+                    clicked_index = get_clicked_tile(pos)
+                    if clicked_index is not None:
+                        set_board(*slide_tile(current_board_v, clicked_index, blank_index))
+                        if is_solved:
                             print("Puzzle Solved Manually!")
 
                 # SHUFFLE
@@ -199,75 +154,76 @@ def main():
                     solving_results = None
                     solving_path = None
                     path_index = 0
-                    current_board_tuple = shuffle_board()
+                    # A result still in flight is for the old board and gets dropped
+                    pending_board = None
+                    set_board(shuffle_board())
+                    full_redraw = True
                 
                 # ACTION (SOLVE / NEXT STEP)
                 elif ACTION_RECT.collidepoint(pos):
                     if not solving:
-                        solving_path, results = solve_and_prepare_path(current_board_tuple)
-                        if solving_path:
-                            solving = True
-                            solving_results = results
-                            path_index = 0
+                        if pending_board is None:
+                            pending_board = current_board_v
+                            start_solve(current_board_v)
                     else:
                         # NEXT STEP
-                        if path_index < len(solving_path):
-                            current_board_tuple = solving_path[path_index].board
-                            path_index += 1
-                            if path_index == len(solving_path):
-                                 solving = False
-                                 print("Solution Animation Complete (Stepped through)!")
+                        set_board(solving_path[path_index])
+                        path_index += 1
+                        if path_index == len(solving_path):
+                            solving = False
+                            print("Solution Animation Complete (Stepped through)!")
                         
                 # RESET
                 elif solving and RESET_RECT.collidepoint(pos):
                     solving = False
-                    if solving_path:
-                        current_board_tuple = solving_path[0].board
-                        solving_path = None
-                        path_index = 0
-                        print("Solving visualization reset.")
-        
-        # --- Drawing ---
-        draw_board(SCREEN, current_board_tuple)
-        
-        draw_info_label(SCREEN) 
-        draw_scoreboard(SCREEN)
+                    set_board(solving_path[0])
+                    solving_path = None
+                    path_index = 0
+                    print("Solving visualization reset.")
         
-        # Buttons
-        draw_button(SCREEN, SHUFFLE_RECT, "SHUFFLE", DARK_GRAY)
-
-        if not solving:
-            draw_button(SCREEN, ACTION_RECT, "SOLVE (A*)", GREEN)
+        # --- Solver Result ---
+        try:
+            board, solution_boards, explored = SOLVE_QUEUE.get_nowait()
+        except queue.Empty:
+            pass
         else:
-            if path_index < len(solving_path):
-                 draw_button(SCREEN, ACTION_RECT, "NEXT STEP", GREEN)
-            else:
-                 draw_button(SCREEN, ACTION_RECT, "FINISHED", DARK_GRAY)
-
-        if solving:
-            draw_button(SCREEN, RESET_RECT, "STOP/RESET", RED)
+            if board == pending_board:
+                pending_board = None
+                solving_path, results = prepare_path(solution_boards, explored)
+                if solving_path:
+                    solving = True
+                    solving_results = results
+                    path_index = 0
+                    full_redraw = True
 
-        # Status Message 
-        if current_board_tuple == GOAL_STATE:
-            status_text = FONT.render("SOLVED!", True, GREEN)
-        elif not solving and solving_results:
-             status_text = FONT.render("PDB Metrics Above", True, BLACK)
+        # --- Drawing ---
+        controls = get_controls_state()
+
+        if full_redraw:
+            SCREEN.fill(WHITE)
+            draw_board(SCREEN, current_board_v)
+            draw_controls(SCREEN)
+            pygame.display.flip()
+            full_redraw = False
         else:
-            status_text = FONT.render("Ready to Play or Solve", True, BLACK)
+            dirty_rects = draw_changed_tiles(SCREEN, current_board_v, prev_board)
+            if controls != prev_controls:
+                draw_controls(SCREEN)
+                dirty_rects.append(CONTROLS_RECT)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
 
-        status_rect = status_text.get_rect(center=(WIDTH // 2, 685))
-        SCREEN.blit(status_text, status_rect)
-        
-        pygame.display.flip()
-        clock.tick(60)
+        prev_board = current_board_v
+        prev_controls = controls
+        clock.tick(FPS)
 
 if __name__ == '__main__':
-    # Load the PDB file before starting the main loop!
+    # Load the PDB file before starting the main loop; without it the solver uses Manhattan distance
     try:
-        load_pdb()
+        heuristic_name = HEURISTIC_NAMES[load_pdb()]
+        pygame.display.set_caption(f"8-Puzzle Solver Interactive ({heuristic_name})")
         main()
     except Exception as e:
         print(f"An error occurred: {e}")
-        print("Ensure 'pdb_generator.py' was run and 'pdb_6.dat' exists.")
         pygame.quit()
         sys.exit()
@@ -0,0 +1,240 @@
+# puzzle_gui_draw.py
+# Window setup, pre-rendered surfaces, drawing helpers and board logic shared by puzzle_gui.py
+
+import pygame
+import random
+from solver import PACKED_MOVES, is_solvable, pack_board, get_tile
+
+# --- Pygame Setup ---
+pygame.init()
+WIDTH, HEIGHT = 600, 780  
+SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+pygame.display.set_caption("8-Puzzle Solver Interactive")
+
+# --- Colors and Fonts ---
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+DARK_GRAY = (100, 100, 100)
+GREEN = (50, 200, 50)
+RED = (200, 50, 50)
+FONT_SIZE = 40
+FONT = pygame.font.Font(None, FONT_SIZE)
+SMALL_FONT = pygame.font.Font(None, 24)
+
+# --- Board Dimensions ---
+GRID_SIZE = 3
+TILE_SIZE = WIDTH // GRID_SIZE
+BOARD_RECT = pygame.Rect(0, 0, WIDTH, WIDTH)
+
+# Everything below the board: buttons, status text, scoreboard and info label
+CONTROLS_RECT = pygame.Rect(0, WIDTH, WIDTH, HEIGHT - WIDTH)
+
+# --- Button Configuration (Fixed Positions) ---
+BUTTON_Y = 610
+BUTTON_H = 50
+BUTTON_W = 160
+
+SHUFFLE_RECT = pygame.Rect(40, BUTTON_Y, BUTTON_W, BUTTON_H) 
+ACTION_RECT = pygame.Rect(220, BUTTON_Y, BUTTON_W, BUTTON_H)
+RESET_RECT = pygame.Rect(400, BUTTON_Y, BUTTON_W, BUTTON_H)
+
+# Info Label Position
+INFO_LABEL_RECT = pygame.Rect(10, HEIGHT - 70, WIDTH - 20, 30)
+
+# Results box shown after a solve
+SCOREBOARD_RECT = pygame.Rect(50, HEIGHT - 110, WIDTH - 100, 70)
+
+# Strip holding the three buttons
+BUTTON_BAR_RECT = pygame.Rect(0, BUTTON_Y, WIDTH, BUTTON_H)
+
+# --- Text Cache ---
+
+_TEXT_CACHE = {}
+
+def cached_text(string, font=FONT, color=BLACK, background=None):
+    """Returns the rendered surface for string, rasterizing it only on the first request."""
+    key = (string, id(font), color, background)
+    text_surface = _TEXT_CACHE.get(key)
+    if text_surface is None:
+        if background is not None:
+            # Text that always sits on one solid color is anti-aliased against it and kept opaque
+            text_surface = font.render(string, True, color, background).convert()
+        else:
+            # Text drawn over changing backgrounds needs per-pixel alpha; convert it to the
+            # display format once
+            text_surface = font.render(string, True, color).convert_alpha()
+        _TEXT_CACHE[key] = text_surface
+    return text_surface
+
+# Heuristic the solver runs with, keyed by what load_pdb returned (whether the PDB was found)
+HEURISTIC_NAMES = {True: "Pattern Database", False: "Manhattan Distance"}
+
+def render_info_label(heuristic):
+    """Renders the mode label for a heuristic and returns it with its centered position."""
+    surface = cached_text(f"Mode: Puzzle Solver (H: {heuristic})", SMALL_FONT, BLACK, WHITE)
+    return surface, surface.get_rect(center=INFO_LABEL_RECT.center)
+
+# The mode label only depends on the heuristic, so each one is rendered and positioned once
+INFO_LABELS = {name: render_info_label(name) for name in HEURISTIC_NAMES.values()}
+
+# Status line while the solver thread runs: one cached frame per spinner position
+SPINNER_FRAMES = [cached_text(f"Solving {c}") for c in "|/-\\"]
+SPINNER_FRAME_MS = 120
+
+def get_spinner_frame():
+    """Index of the spinner frame to show right now."""
+    return pygame.time.get_ticks() // SPINNER_FRAME_MS % len(SPINNER_FRAMES)
+
+# --- Pre-rendered Tiles ---
+
+def render_tile(tile_value):
+    """Bakes the fill, border and number of a single tile into its own surface."""
+    surface = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    tile_rect = surface.get_rect()
+    surface.fill(DARK_GRAY)
+    pygame.draw.rect(surface, BLACK, tile_rect, 3)
+
+    if tile_value != 0:
+        glyph = GLYPHS[tile_value]
+        surface.blit(glyph, glyph.get_rect(center=tile_rect.center))
+    return surface
+
+# GLYPHS[v] is the rasterized number for tile v (no glyph for the blank)
+GLYPHS = [None] + [FONT.render(str(d), True, WHITE).convert_alpha()
+                   for d in range(1, GRID_SIZE * GRID_SIZE)]
+
+# TILE_SURFACES[v] is the finished tile for value v; TILE_POSITIONS[k] is the top-left of
+# board index k
+TILE_SURFACES = [render_tile(value) for value in range(GRID_SIZE * GRID_SIZE)]
+TILE_POSITIONS = [(j * TILE_SIZE, i * TILE_SIZE)
+                  for i in range(GRID_SIZE) for j in range(GRID_SIZE)]
+TILE_RECTS = [pygame.Rect(x, y, TILE_SIZE, TILE_SIZE) for x, y in TILE_POSITIONS]
+
+# Surface.fblits (pygame-ce) skips the per-item checks and rect list of blits(); fall back on
+# plain pygame
+if hasattr(pygame.Surface, "fblits"):
+    def blit_batch(screen, blit_sequence):
+        screen.fblits(blit_sequence)
+else:
+    def blit_batch(screen, blit_sequence):
+        screen.blits(blit_sequence, doreturn=False)
+
+# --- Drawing Functions ---
+
+def draw_board(screen, board):
+    """Draws the 3x3 grid of tiles in a single batched blit."""
+    blit_batch(screen, [(TILE_SURFACES[get_tile(board, k)], TILE_POSITIONS[k])
+                        for k in range(GRID_SIZE * GRID_SIZE)])
+
+def draw_changed_tiles(screen, board, prev_board):
+    """Redraws only the tiles that differ from prev_board and returns their rects."""
+    diff = board ^ prev_board
+    changed = [k for k in range(GRID_SIZE * GRID_SIZE) if get_tile(diff, k)]
+    blit_batch(screen, [(TILE_SURFACES[get_tile(board, k)], TILE_POSITIONS[k]) for k in changed])
+    return [TILE_RECTS[k] for k in changed]
+
+def render_button(text, color):
+    """Renders one button (rounded fill plus centered label) onto its own surface."""
+    text_surface = cached_text(text)
+    # Some labels are wider than the button; keep their overhang instead of clipping it
+    surface = pygame.Surface((max(BUTTON_W, text_surface.get_width()), BUTTON_H)).convert()
+    surface.fill(WHITE) # Buttons always sit on the white controls area
+    button_rect = pygame.Rect(0, 0, BUTTON_W, BUTTON_H)
+    button_rect.center = surface.get_rect().center
+    pygame.draw.rect(surface, color, button_rect, 0, 10)
+    surface.blit(text_surface, text_surface.get_rect(center=button_rect.center))
+    return surface
+
+# One surface per (label, color) combination the GUI ever shows
+BUTTON_CACHE = {
+    (text, color): render_button(text, color)
+    for text, color in [
+        ("SHUFFLE", DARK_GRAY),
+        ("SOLVE (A*)", GREEN),
+        ("NEXT STEP", GREEN),
+        ("STOP/RESET", RED),
+    ]
+}
+
+def draw_button(screen, rect, text, color):
+    """Draws a clickable button from its pre-rendered surface."""
+    button_surface = BUTTON_CACHE[(text, color)]
+    screen.blit(button_surface, button_surface.get_rect(center=rect.center))
+
+def render_button_bar(buttons):
+    """Renders a full button strip for one UI state from (rect, text, color) entries."""
+    surface = pygame.Surface(BUTTON_BAR_RECT.size).convert()
+    surface.fill(WHITE)
+    for rect, text, color in buttons:
+        draw_button(surface, rect.move(-BUTTON_BAR_RECT.left, -BUTTON_BAR_RECT.top), text, color)
+    return surface
+
+# One pre-rendered strip per state: not solving / stepping through the solution
+BUTTON_BARS = {
+    "idle": render_button_bar([
+        (SHUFFLE_RECT, "SHUFFLE", DARK_GRAY),
+        (ACTION_RECT, "SOLVE (A*)", GREEN),
+    ]),
+    "next": render_button_bar([
+        (SHUFFLE_RECT, "SHUFFLE", DARK_GRAY),
+        (ACTION_RECT, "NEXT STEP", GREEN),
+        (RESET_RECT, "STOP/RESET", RED),
+    ]),
+}
+
+def draw_info_label(screen, heuristic):
+    """Draws a single label showing the active heuristic mode."""
+    screen.blit(*INFO_LABELS[heuristic])
+
+def render_scoreboard(moves, explored, heuristic):
+    """Renders the results box once per solve: rounded background plus its three text lines."""
+    surface = pygame.Surface(SCOREBOARD_RECT.size).convert()
+    box_rect = surface.get_rect()
+    surface.fill(WHITE)
+    pygame.draw.rect(surface, DARK_GRAY, box_rect, 0, 10)
+    
+    heuristic_text = cached_text(f"H: {heuristic}", SMALL_FONT, WHITE)
+    moves_text = SMALL_FONT.render(f"Moves: {moves}", True, WHITE)
+    explored_text = SMALL_FONT.render(f"Nodes Explored: {explored}", True, WHITE)
+
+    blit_batch(surface, [
+        (heuristic_text, (box_rect.left + 10, box_rect.top + 5)),
+        (moves_text, (box_rect.left + 10, box_rect.top + 35)),
+        (explored_text, (box_rect.right - explored_text.get_width() - 10, box_rect.top + 35)),
+    ])
+    return surface
+
+def draw_scoreboard(screen, results):
+    """Draws the performance results after a solve is complete."""
+    if not results:
+        return
+    screen.blit(results["scoreboard"], SCOREBOARD_RECT)
+
+# --- Game Logic Functions ---
+
+def get_clicked_tile(pos):
+    """Converts mouse position to a flat board index."""
+    if BOARD_RECT.collidepoint(pos):
+        return (pos[1] // TILE_SIZE) * GRID_SIZE + pos[0] // TILE_SIZE
+    return None
+
+def slide_tile(board, current_index, blank_index):
+    """Handles the sliding logic when a tile is clicked. Returns the new board and blank index."""
+    # A tile can slide only if it is orthogonally adjacent to the blank,
+    # i.e. one of the blank's legal moves
+    for _, target, shift, step in PACKED_MOVES[blank_index]:
+        if target == current_index:
+            return board + ((board >> shift) & 0xF) * step, target
+        
+    return board, blank_index
+
+def shuffle_board():
+    """Generates a random, guaranteed solvable board (packed), uniform over all solvable boards."""
+    temp_list = [i for i in range(9)]
+    random.shuffle(temp_list)
+    if not is_solvable(temp_list):
+        # Swapping two non-blank tiles flips the inversion parity, so no reshuffle is needed
+        i = 0 if temp_list[0] != 0 else 2
+        j = 1 if temp_list[1] != 0 else 2
+        temp_list[i], temp_list[j] = temp_list[j], temp_list[i]
+    return pack_board(temp_list)
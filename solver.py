@@ -1,163 +1,386 @@
 # solver.py (UPDATED for PDB)
 
 import heapq
-import collections
+import itertools
+import math
+import mmap
+import os
 import pickle
-import sys
 
 # --- Constants ---
 GOAL_STATE = (1, 2, 3, 4, 5, 6, 7, 8, 0)
-PATTERN_TILES = {1, 2, 3, 4, 5, 6}
+
+DIRECTIONS = [('Up', -1, 0), ('Down', 1, 0), ('Left', 0, -1), ('Right', 0, 1)]
+
+# MOVES[i] lists (action, target_index) for every legal move of a blank at index i
+MOVES = [
+    [(action, (i // 3 + dr) * 3 + i % 3 + dc)
+     for action, dr, dc in DIRECTIONS
+     if 0 <= i // 3 + dr < 3 and 0 <= i % 3 + dc < 3]
+    for i in range(9)
+]
+
+# MD[tile][pos] is tile's Manhattan distance contribution when it sits at pos (0 for the blank);
+# tile t belongs at index t - 1 in GOAL_STATE
+MD = [[abs(pos // 3 - (tile - 1) // 3) + abs(pos % 3 - (tile - 1) % 3) if tile else 0
+       for pos in range(9)]
+      for tile in range(9)]
+
+# PACKED_MOVES[i] lists (action, target_index, target_shift, step) for the same moves on a packed
+# board: sliding tile t from target_index into the blank adds t * step to the board
+PACKED_MOVES = [
+    [(action, target, 4 * target, (1 << (4 * i)) - (1 << (4 * target)))
+     for action, target in MOVES[i]]
+    for i in range(9)
+]
+
+# FORWARD_MOVES[i][prev] is PACKED_MOVES[i] without the move back to prev, the blank's index
+# before its last move (NO_PREV when there was none): that move only ever leads back to the
+# parent board
+NO_PREV = 9
+FORWARD_MOVES = [
+    [[move for move in PACKED_MOVES[i] if move[1] != prev] for prev in range(NO_PREV + 1)]
+    for i in range(9)
+]
+
+# MOVE_ACTION[(blank, target)] is the action that moves the blank from index blank to index target
+MOVE_ACTION = {(i, target): action for i in range(9) for action, target in MOVES[i]}
+
+# --- Packed Boards ---
+# Boards are stored as one int with 4 bits per cell, index i in bits 4*i..4*i+3; the solvers and
+# the GUI share this layout. Hashing and comparing an int is a single machine operation and a move
+# is a few bit ops.
+
+def pack_board(board):
+    """Packs a 9-tile sequence into an int (tile at index i in nibble i)."""
+    packed = 0
+    for i, tile in enumerate(board):
+        packed |= tile << (4 * i)
+    return packed
+
+def unpack_board(packed):
+    """Expands a packed board back into a tuple."""
+    return tuple((packed >> (4 * i)) & 0xF for i in range(9))
+
+def get_tile(packed, i):
+    """Returns the tile at board index i of a packed board."""
+    return (packed >> (4 * i)) & 0xF
+
+def find_blank(packed):
+    """Returns the board index of the blank in a packed board."""
+    for i in range(9):
+        if not (packed >> (4 * i)) & 0xF:
+            return i
+
+GOAL_PACKED = pack_board(GOAL_STATE)
 
 # --- PDB Global Data ---
-PDB_6_DATA = {}
+# PDB_6_ARRAY[index] is the PDB cost of the pattern key (pos_of_1, ..., pos_of_6, pos_of_0) read as
+# a 7-digit base-9 number; one byte per entry, 0 where the key is absent (or before load_pdb runs)
+PDB_KEY_TILES = (1, 2, 3, 4, 5, 6, 0)
+PDB_ARRAY_SIZE = 9 ** len(PDB_KEY_TILES)
+PDB_6_ARRAY = bytes(PDB_ARRAY_SIZE)
+
+PDB_FILE = 'pdb_6.dat'       # Pickled {key: cost} dict written by pdb_generator.py
+PDB_ARRAY_FILE = 'pdb_6.bin' # The same table as raw PDB_6_ARRAY bytes, memory-mapped by load_pdb
+
+# Set by load_pdb once the PDB is in memory; until then solve_packed falls back on
+# bidirectional_a_star
+PDB_LOADED = False
+
+def pdb_index(key):
+    """Packs a PDB key tuple into its PDB_6_ARRAY index."""
+    index = 0
+    for position in key:
+        index = index * 9 + position
+    return index
+
+# PDB_INDEX_WEIGHT[i][tile] is what tile sitting at index i adds to the PDB index (0 for
+# non-pattern tiles)
+PDB_INDEX_WEIGHT = [
+    [i * 9 ** (len(PDB_KEY_TILES) - 1 - PDB_KEY_TILES.index(tile)) if tile in PDB_KEY_TILES else 0
+     for tile in range(9)]
+    for i in range(9)
+]
 
 # --- Utility Class ---
 class PuzzleState:
     """Represents a state of the 8-puzzle."""
-    def __init__(self, board, parent=None, action=None, cost=0, heuristic_cost=0):
+    __slots__ = ('board', 'blank', 'parent', 'action', 'cost') # No per-instance __dict__
+
+    def __init__(self, board, parent=None, action=None, cost=0, blank=None):
         self.board = board       # Tuple representing the board (e.g., (1, 2, 3, 4, 5, 6, 7, 8, 0))
+        # Index of the blank, carried along so it is never searched for
+        self.blank = board.index(0) if blank is None else blank
         self.parent = parent     # Previous state in the path
         self.action = action     # Action taken to reach this state
         self.cost = cost         # g(n): moves from start to current state
-        self.heuristic_cost = heuristic_cost # h(n): heuristic estimate
-        self.f_cost = cost + heuristic_cost # f(n) = g(n) + h(n)
-
-    def __lt__(self, other):
-        """Used for priority queue comparison (f_cost)."""
-        return self.f_cost < other.f_cost
-
-    def __hash__(self):
-        """Allows state to be used as a dictionary key."""
-        return hash(self.board)
-
-    def __eq__(self, other):
-        """Allows comparison of states."""
-        return self.board == other.board
 
 # --- Heuristic and Utility Functions ---
 
 def is_solvable(board):
     """Determines if the given board is solvable using inversion counting."""
-    inversions = 0
     board_list = [i for i in board if i != 0]
     
-    for i in range(len(board_list)):
-        for j in range(i + 1, len(board_list)):
-            if board_list[i] > board_list[j]:
-                inversions += 1
+    # All 28 tile pairs are compared inside itertools.combinations/sum rather than a nested
+    # Python loop
+    inversions = sum(a > b for a, b in itertools.combinations(board_list, 2))
                 
     # 8-puzzle (3x3 grid) is solvable if the number of inversions is even.
     return inversions % 2 == 0
 
-def get_neighbors(board):
-    """Generates all valid neighbor board states."""
-    board_list = list(board)
-    zero_index = board_list.index(0)
-    r, c = zero_index // 3, zero_index % 3
-    
-    neighbors = []
-    moves = [('Up', -1, 0), ('Down', 1, 0), ('Left', 0, -1), ('Right', 0, 1)]
-    
-    for action, dr, dc in moves:
-        new_r, new_c = r + dr, c + dc
-        
-        if 0 <= new_r < 3 and 0 <= new_c < 3:
-            swap_index = new_r * 3 + new_c
-            
-            new_board_list = board_list[:]
-            new_board_list[zero_index], new_board_list[swap_index] = \
-                new_board_list[swap_index], new_board_list[zero_index]
-            
-            neighbors.append((tuple(new_board_list), action))
-            
-    return neighbors
+def manhattan_distance(board):
+    """Manhattan Distance Heuristic: sum of each tile's row and column distance from its goal."""
+    md = MD
+    return (md[board[0]][0] + md[board[1]][1] + md[board[2]][2] +
+            md[board[3]][3] + md[board[4]][4] + md[board[5]][5] +
+            md[board[6]][6] + md[board[7]][7] + md[board[8]][8])
+
+def flatten_pdb(pdb_data):
+    """Flattens a {key: cost} PDB dict into the index-addressed bytes pdb_heuristic reads."""
+    pdb_array = bytearray(PDB_ARRAY_SIZE)
+    for key, cost in pdb_data.items():
+        pdb_array[pdb_index(key)] = cost
+    return bytes(pdb_array)
+
+def pdb_array_is_current():
+    """
+    True when PDB_ARRAY_FILE holds a whole table and is at least as new as PDB_FILE, so it can be
+    mapped as is; a truncated, empty or stale file has to be rebuilt from PDB_FILE.
+    """
+    try:
+        array_stat = os.stat(PDB_ARRAY_FILE)
+    except OSError:
+        return False
+    if array_stat.st_size != PDB_ARRAY_SIZE:
+        return False
+    try:
+        return array_stat.st_mtime >= os.stat(PDB_FILE).st_mtime
+    except OSError:
+        return True # Only the raw table is there, so there is nothing newer to rebuild it from
 
 def load_pdb():
-    """Loads the pre-calculated PDB data from the file."""
-    global PDB_6_DATA
+    """Loads the pre-calculated PDB data from the file. Returns False when there is none to load."""
+    global PDB_6_ARRAY, PDB_LOADED
     try:
-        with open('pdb_6.dat', 'rb') as f:
-            PDB_6_DATA = pickle.load(f)
+        if pdb_array_is_current():
+            # Mapping the raw table needs no deserializing, and its pages are shared between
+            # processes
+            with open(PDB_ARRAY_FILE, 'rb') as f:
+                PDB_6_ARRAY = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # First run, or pdb_6.dat was regenerated: unpickle the dict once and save it as the raw
+            # table for every later start
+            with open(PDB_FILE, 'rb') as f:
+                PDB_6_ARRAY = flatten_pdb(pickle.load(f))
+            try:
+                with open(PDB_ARRAY_FILE + '.tmp', 'wb') as f:
+                    f.write(PDB_6_ARRAY)
+                # Never leave a half-written table behind
+                os.replace(PDB_ARRAY_FILE + '.tmp', PDB_ARRAY_FILE)
+            except OSError as e:
+                print(f"Could not save '{PDB_ARRAY_FILE}' ({e}); "
+                      "the PDB will be unpickled again next time.")
+        PDB_LOADED = True
         print("PDB (6-tile) loaded successfully for A* search.")
+        return True
     except FileNotFoundError:
-        print("PDB file 'pdb_6.dat' not found. Please run pdb_generator.py first.")
-        sys.exit(1)
+        print(f"PDB file '{PDB_FILE}' not found; solving with Manhattan distance instead. "
+              "Run pdb_generator.py for the PDB solver.")
+        return False
 
 def pdb_heuristic(board):
     """
     PDB Heuristic: Looks up the exact minimum cost for the 6-tile pattern.
+    Takes a packed board.
     """
     
-    # 1. Create the unique key from the current board state
-    # Key format: (pos_of_1, pos_of_2, ..., pos_of_6, pos_of_0)
-    key_list = [0] * (len(PATTERN_TILES) + 1)
-    
-    for i, tile in enumerate(board):
-        if tile in PATTERN_TILES:
-            key_list[tile - 1] = i
-        elif tile == 0:
-            key_list[-1] = i
-            
-    key = tuple(key_list)
+    # 1. Build the array index of the key (pos_of_1, pos_of_2, ..., pos_of_6, pos_of_0) straight
+    # from the board's nibbles, without materializing the key tuple
+    w = PDB_INDEX_WEIGHT
+    index = (w[0][board & 0xF] + w[1][(board >> 4) & 0xF] + w[2][(board >> 8) & 0xF] +
+             w[3][(board >> 12) & 0xF] + w[4][(board >> 16) & 0xF] + w[5][(board >> 20) & 0xF] +
+             w[6][(board >> 24) & 0xF] + w[7][(board >> 28) & 0xF] + w[8][board >> 32])
     
-    # 2. Lookup the cost in the loaded global PDB data
-    return PDB_6_DATA.get(key, 0) # Fallback to 0 if key error occurs
+    # 2. Lookup the cost in the loaded global PDB data (0 for a key the PDB does not hold)
+    return PDB_6_ARRAY[index]
 
 # --- A* Solver ---
 
-def solve_puzzle(start_board): # NOTE: Heuristic argument is removed, PDB is hardcoded
-    """A* search algorithm to find the shortest path to the goal."""
+def reconstruct_path(closed_set, board):
+    """Follows closed_set's parent links back from a packed board; returns the path's boards."""
+    boards = []
+    while board is not None:
+        boards.append(board)
+        board = closed_set[board][1]
+    boards.reverse()
+    return boards
+
+def path_from_boards(boards):
+    """
+    Builds the PuzzleState path for a sequence of packed boards, recovering each action from the
+    blank's move.
+    """
+    state = None
+    path = []
+    for board in boards:
+        board = unpack_board(board)
+        blank = board.index(0)
+        action = MOVE_ACTION[(state.blank, blank)] if state else None
+        state = PuzzleState(board, parent=state, action=action, cost=len(path), blank=blank)
+        path.append(state)
+    return path
+
+def solve_puzzle(start_board): # solve_packed picks the heuristic: PDB or Manhattan
+    """A* search for the shortest path to the goal, returned as PuzzleStates on tuple boards."""
+    path, explored_nodes = solve_packed(pack_board(start_board))
+    if isinstance(path, list):
+        path = path_from_boards(path)
+    return path, explored_nodes
+
+def solve_packed(start_packed):
+    """
+    A* search on a packed board. Returns (boards, explored_nodes), where boards lists the packed
+    boards from the start to the goal ("Unsolvable" or None when there is no path, as for
+    solve_puzzle).
+    """
+    if not PDB_LOADED:
+        return bidirectional_a_star(start_packed)
+
+    start_board = unpack_board(start_packed)
     if not is_solvable(start_board):
         return "Unsolvable", 0
+    start_blank = start_board.index(0)
 
-    start_state = PuzzleState(start_board)
-    
-    # Initial cost calculation using the powerful PDB heuristic
-    start_state.heuristic_cost = pdb_heuristic(start_state.board) 
-    start_state.f_cost = start_state.cost + start_state.heuristic_cost
-    
-    # Priority Queue: stores states to be explored (f_cost is the priority)
-    open_set = [start_state]
-    # Dictionary for O(1) lookup of minimum cost found so far to reach a board state
-    closed_set = {start_board: start_state.cost}
+    # Priority Queue: (f_cost, heuristic_cost, cost, board, blank, prev_blank) tuples, compared
+    # in C; on equal f the lower h (deeper) entry comes out first, as it is closer to the goal
+    start_h = pdb_heuristic(start_packed)
+    open_set = [(start_h, start_h, 0, start_packed, start_blank, NO_PREV)]
+    # closed_set[board] = (cost, parent_board) for the cheapest path found so far to a board:
+    # its O(1) lookup gives the cost to beat, and it replaces PuzzleState.parent for the path
+    closed_set = {start_packed: (0, None)}
     
     explored_nodes = 0
 
+    # The loop below runs once per expansion: bind the functions it calls to locals
+    # so each call skips the module-global lookup.
+    heappush, heappop = heapq.heappush, heapq.heappop
+    heuristic, moves = pdb_heuristic, FORWARD_MOVES
+    closed_get = closed_set.get
+
     while open_set:
-        current_state = heapq.heappop(open_set)
+        f_cost, h_cost, cost, board, blank, prev_blank = heappop(open_set)
+        # A cheaper path to this board was pushed after this entry; that one has been or will be
+        # expanded
+        if cost > closed_set[board][0]:
+            continue
         explored_nodes += 1
         
-        if current_state.board == GOAL_STATE:
-            # Reconstruct path and return
-            path = []
-            while current_state:
-                path.append(current_state)
-                current_state = current_state.parent
-            return path[::-1], explored_nodes # Return path from start to goal
-
-        for neighbor_board, action in get_neighbors(current_state.board):
-            new_cost = current_state.cost + 1
-            
+        if board == GOAL_PACKED:
+            return reconstruct_path(closed_set, board), explored_nodes
+
+        new_cost = cost + 1
+        # Each neighbor is built in place, with no list or tuple per move
+        for _, neighbor_blank, shift, step in moves[blank][prev_blank]:
+            neighbor_board = board + ((board >> shift) & 0xF) * step
+
             # Check if this neighbor has already been reached with an equal or lower cost
-            if neighbor_board in closed_set and new_cost >= closed_set[neighbor_board]:
+            best = closed_get(neighbor_board)
+            if best is not None and new_cost >= best[0]:
                 continue
 
-            # This path is better, or the state is new
-            closed_set[neighbor_board] = new_cost
+            # This path is better, or the state is new: one insert records both cost and parent
+            closed_set[neighbor_board] = (new_cost, board)
             
-            neighbor_state = PuzzleState(
-                board=neighbor_board,
-                parent=current_state,
-                action=action,
-                cost=new_cost,
-            )
-            
-            # Calculate PDB heuristic cost for the neighbor
-            neighbor_state.heuristic_cost = pdb_heuristic(neighbor_state.board)
-            neighbor_state.f_cost = neighbor_state.cost + neighbor_state.heuristic_cost
-            
-            # Add to the open set
-            heapq.heappush(open_set, neighbor_state)
+            # Calculate PDB heuristic cost for the neighbor and add it to the open set
+            h_cost = heuristic(neighbor_board)
+            heappush(open_set, (new_cost + h_cost, h_cost, new_cost, neighbor_board, neighbor_blank,
+                                blank))
 
     return None, explored_nodes
+
+# --- Bidirectional A* Solver ---
+
+def bidirectional_a_star(start_packed):
+    """
+    Bidirectional A* with the Manhattan distance heuristic: one search forward from the start and
+    one backward from the goal, stopping once neither frontier can beat the best meeting point.
+    Takes and returns packed boards like solve_packed, which uses it when no PDB is loaded.
+    """
+    start_board = unpack_board(start_packed)
+    if not is_solvable(start_board):
+        return "Unsolvable", 0
+
+    # The backward search aims at the start board, so it needs Manhattan distances to the
+    # start's cells
+    start_cell = [0] * 9
+    for i, tile in enumerate(start_board):
+        start_cell[tile] = i
+    md_to_start = [[abs(pos // 3 - start_cell[tile] // 3) + abs(pos % 3 - start_cell[tile] % 3)
+                    if tile else 0
+                    for pos in range(9)]
+                   for tile in range(9)]
+
+    # One (open_set, closed_set, distance table) per direction, laid out like solve_puzzle's:
+    # open entries are (f_cost, heuristic_cost, cost, board, blank, prev_blank),
+    # closed_set[board] = (cost, parent_board)
+    start_h = manhattan_distance(start_board)
+    forward = ([(start_h, start_h, 0, start_packed, start_cell[0], NO_PREV)],
+               {start_packed: (0, None)}, MD)
+    backward = ([(start_h, start_h, 0, GOAL_PACKED, GOAL_STATE.index(0), NO_PREV)],
+                {GOAL_PACKED: (0, None)}, md_to_start)
+
+    # Cheapest start-to-goal path seen so far, as its length and the board where the two
+    # searches met
+    best_cost, meet = (0, start_packed) if start_packed == GOAL_PACKED else (math.inf, None)
+    explored_nodes = 0
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while forward[0] and backward[0]:
+        # Both f values are lower bounds on any path through the unexpanded parts of their frontiers
+        if best_cost <= max(forward[0][0][0], backward[0][0][0]):
+            break
+
+        # Expand the side with the higher best f: raising that bound is what satisfies the
+        # stopping test
+        (open_set, closed_set, md), other_closed = (
+            (forward, backward[1]) if forward[0][0] >= backward[0][0] else (backward, forward[1]))
+        f_cost, h_cost, cost, board, blank, prev_blank = heappop(open_set)
+        if cost > closed_set[board][0]:
+            continue
+        explored_nodes += 1
+
+        new_cost = cost + 1
+        for _, target, shift, step in FORWARD_MOVES[blank][prev_blank]:
+            tile = (board >> shift) & 0xF
+            neighbor_board = board + tile * step
+            best = closed_set.get(neighbor_board)
+            if best is not None and new_cost >= best[0]:
+                continue
+            closed_set[neighbor_board] = (new_cost, board)
+
+            # Reached from the other side as well: that joins a complete start-to-goal path
+            other = other_closed.get(neighbor_board)
+            if other is not None and new_cost + other[0] < best_cost:
+                best_cost, meet = new_cost + other[0], neighbor_board
+
+            # The tile at target slides into the blank; it is the only tile whose distance changes
+            neighbor_h = h_cost + md[tile][blank] - md[tile][target]
+            heappush(open_set, (new_cost + neighbor_h, neighbor_h, new_cost, neighbor_board, target,
+                                blank))
+
+    if meet is None:
+        return None, explored_nodes
+
+    # Start -> meet along the forward parents, then meet -> goal along the backward ones
+    boards = []
+    board = meet
+    while board is not None:
+        boards.append(board)
+        board = forward[1][board][1]
+    boards.reverse()
+    board = backward[1][meet][1]
+    while board is not None:
+        boards.append(board)
+        board = backward[1][board][1]
+    return boards, explored_nodes